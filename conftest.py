@@ -0,0 +1,33 @@
+"""
+Failure artifacts for the top-level Playwright smoke tests (smoke_test_ui.py).
+Only acts on tests that use its `fresh_context` or `shared_context` fixtures; backend/tests is unaffected.
+"""
+
+import pytest
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Save a screenshot (and the trace, when recording) for a failed smoke test"""
+    outcome = yield
+    report = outcome.get_result()
+    if report.when != "call" or not report.failed:
+        return
+
+    # Doctest and other non-function items have no funcargs
+    funcargs = getattr(item, "funcargs", {})
+    context = funcargs.get("fresh_context") or funcargs.get("shared_context")
+    if context is None:
+        return
+
+    if context.pages:
+        try:
+            context.pages[-1].screenshot(path=f"{item.name}.png")
+            print(f"   📸 Screenshot saved to {item.name}.png")
+        except Exception as e:
+            print(f"   ⚠ Could not save screenshot: {e}")
+
+    if getattr(item, "smoke_tracing", False):
+        context.tracing.stop(path=f"{item.name}.zip")
+        item.smoke_tracing = False
+        print(f"   🧭 Trace saved to {item.name}.zip (npx playwright show-trace {item.name}.zip)")
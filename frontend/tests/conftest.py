@@ -0,0 +1,39 @@
+"""
+Shared pytest fixtures for the frontend E2E tests.
+One headless Chromium per worker session, a fresh context and page per test.
+"""
+
+import pytest_asyncio
+from playwright.async_api import async_playwright, expect
+
+from test_ui_components import new_test_context
+
+# These suites are asyncio scripts run with `python <file>`; their test_* coroutines
+# take explicit browser/context arguments and return pass/fail flags
+collect_ignore = [
+    "run_all_tests.py",
+    "test_chat_functionality.py",
+    "test_theme_toggle.py",
+    "test_ui_components.py",
+]
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def browser():
+    """Chromium shared by every test in the worker"""
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        yield browser
+        await browser.close()
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def page(browser):
+    """Isolated context with the app loaded and the theme toggle ready"""
+    # Same DOM-assertion context as the UI suite; the toggle tests only read DOM state
+    context = await new_test_context(browser)
+    page = await context.new_page()
+    await page.goto("http://localhost:8000", wait_until="domcontentloaded")
+    await expect(page.locator("#themeToggle")).to_be_visible()
+    yield page
+    await context.close()
@@ -6,309 +6,378 @@ Verifies light/dark mode switching, persistence, and accessibility.
 """
 
 import asyncio
+import io
+import os
 import re
-from playwright.async_api import async_playwright, expect
+import sys
 
+import httpx
+from playwright.async_api import BrowserContext, async_playwright, expect
 
-async def test_theme_toggle_button():
+# Headless by default; PW_HEADED=1 opens a window and keeps the visual inspection pauses
+HEADLESS = os.environ.get("PW_HEADED") != "1"
+
+# Matches the body class set by the light theme
+LIGHT_RE = re.compile(r"\blight-theme\b")
+
+# Screenshots are opt-in; when enabled, clip to the top of the viewport and encode as JPEG
+SCREENSHOTS = os.environ.get("SCREENSHOTS") == "1"
+SCREENSHOT_OPTIONS = {
+    "full_page": False,
+    "clip": {"x": 0, "y": 0, "width": 1280, "height": 400},
+    "type": "jpeg",
+    "quality": 70,
+}
+
+
+def theme_storage_state(theme):
+    """Storage state that opens the app with the given theme already saved"""
+    return {
+        "cookies": [],
+        "origins": [
+            {
+                "origin": "http://localhost:8000",
+                "localStorage": [{"name": "theme", "value": theme}],
+            }
+        ],
+    }
+
+
+async def expect_theme(body, light):
+    """Wait until the body reflects the expected theme"""
+    if light:
+        await expect(body).to_have_class(LIGHT_RE)
+    else:
+        await expect(body).not_to_have_class(LIGHT_RE)
+
+
+async def snapshot(page):
+    """Read theme class and stored theme in a single round-trip"""
+    return await page.evaluate("""() => ({
+        hasLight: document.body.classList.contains('light-theme'),
+        storedTheme: localStorage.getItem('theme')
+    })""")
+
+
+async def icon_state(page, sun_opacity, moon_opacity):
+    """Poll sun/moon icon counts and opacities in one evaluate until they settle
+
+    Returns as soon as both icons show the expected opacity, or immediately
+    when an icon is missing so the caller can report it.
+    """
+    handle = await page.wait_for_function(
+        """([sunOpacity, moonOpacity]) => {
+            const s = document.querySelectorAll('.sun-icon');
+            const m = document.querySelectorAll('.moon-icon');
+            const o = el => el ? getComputedStyle(el).opacity : null;
+            const icons = {sc: s.length, mc: m.length, so: o(s[0]), mo: o(m[0])};
+            const settled = icons.so === sunOpacity && icons.mo === moonOpacity;
+            return (settled || !icons.sc || !icons.mc) && icons;
+        }""",
+        arg=[sun_opacity, moon_opacity],
+        timeout=5000,
+    )
+    return await handle.json_value()
+
+
+async def test_static_presence() -> bool:
+    """Test markup that needs no browser: theme toggle attributes and footer text"""
+    # Imported here so the browser tests don't depend on the HTML parser
+    from selectolax.lexbor import LexborHTMLParser
+    
+    log = io.StringIO()
+    out = log.write
+    out("\n=== Testing Static Markup ===\n\n")
+    
+    try:
+        out("1. Fetching page HTML...\n")
+        async with httpx.AsyncClient() as client:
+            response = await client.get("http://localhost:8000")
+        response.raise_for_status()
+        tree = LexborHTMLParser(response.text)
+        out("✓ Page HTML fetched\n")
+        
+        # Check theme toggle button and its accessibility attributes
+        out("\n2. Checking theme toggle button markup...\n")
+        theme_button = tree.css_first("#themeToggle")
+        assert theme_button is not None, "Theme toggle button not found"
+        aria_label = theme_button.attributes.get("aria-label")
+        title = theme_button.attributes.get("title")
+        assert aria_label, "Theme toggle button has no aria-label"
+        out(f"✓ ARIA label: {aria_label}\n")
+        out(f"✓ Title: {title}\n")
+        
+        # Check footer text content
+        out("\n3. Checking footer content...\n")
+        footer = tree.css_first(".app-footer")
+        assert footer is not None, "Footer not found"
+        footer_text = footer.text()
+        assert "All rights reserved" in footer_text and "Claude" in footer_text, (
+            f"Footer text incorrect: {footer_text}"
+        )
+        assert tree.css_first(".claude-brand") is not None, "Claude brand not found"
+        out(f"✓ Footer contains correct text: {footer_text.strip()}\n")
+        
+        out("\n=== Static Markup Tests Passed! ===\n\n")
+        return True
+        
+    except Exception as e:
+        out(f"\n✗ Static markup test failed with error: {e}\n")
+        return False
+    finally:
+        sys.stdout.write(log.getvalue())
+        sys.stdout.flush()
+
+
+async def test_theme_toggle_button(context: BrowserContext) -> bool:
     """Test theme toggle button exists and is visible"""
-    print("\n=== Testing Theme Toggle Button ===\n")
+    log = io.StringIO()
+    out = log.write
+    out("\n=== Testing Theme Toggle Button ===\n\n")
     
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)
-        page = await browser.new_page()
+    page = await context.new_page()
+    theme_button = page.locator("#themeToggle")
+    body = page.locator("body")
+    
+    try:
+        # Navigate to the application
+        out("1. Navigating to application...\n")
+        await page.goto("http://localhost:8000", wait_until="domcontentloaded")
+        out("✓ Page loaded successfully\n")
         
-        try:
-            # Navigate to the application
-            print("1. Navigating to application...")
-            await page.goto("http://localhost:8000", wait_until="networkidle")
-            print("✓ Page loaded successfully")
-            
-            # Find the theme toggle button
-            print("\n2. Checking if theme toggle button exists...")
-            theme_button = page.locator("#themeToggle")
-            await expect(theme_button).to_be_visible(timeout=5000)
-            print("✓ Theme toggle button is visible")
-            
-            # Check initial state (should be dark theme by default)
-            print("\n3. Checking initial theme state...")
-            body = page.locator("body")
-            has_light_class = await body.evaluate("el => el.classList.contains('light-theme')")
-            if has_light_class:
-                print("✓ Initial theme: Light mode")
-            else:
-                print("✓ Initial theme: Dark mode")
-            
-            # Check button accessibility attributes
-            print("\n4. Checking accessibility attributes...")
-            aria_label = await theme_button.get_attribute("aria-label")
-            title = await theme_button.get_attribute("title")
-            print(f"✓ ARIA label: {aria_label}")
-            print(f"✓ Title: {title}")
-            
-            # Test clicking the button
-            print("\n5. Testing theme toggle by clicking...")
-            initial_theme = has_light_class
-            await theme_button.click()
-            await page.wait_for_timeout(500)  # Wait for transition
-            
-            new_light_class = await body.evaluate("el => el.classList.contains('light-theme')")
-            if new_light_class != initial_theme:
-                print("✓ Theme toggled successfully")
-                print(f"  Theme changed from {'light' if initial_theme else 'dark'} to {'light' if new_light_class else 'dark'}")
-            else:
-                print("✗ Theme did not change")
-                return False
-            
-            # Toggle back
-            print("\n6. Toggling theme back...")
-            await theme_button.click()
-            await page.wait_for_timeout(500)
-            
-            toggled_back = await body.evaluate("el => el.classList.contains('light-theme')")
-            if toggled_back == initial_theme:
-                print("✓ Theme toggled back successfully")
-            else:
-                print("✗ Theme did not toggle back")
-                return False
-            
-            # Test keyboard navigation (Space key)
-            print("\n7. Testing keyboard navigation (Space key)...")
-            await theme_button.focus()
-            await page.keyboard.press("Space")
-            await page.wait_for_timeout(500)
-            
-            space_toggle = await body.evaluate("el => el.classList.contains('light-theme')")
-            if space_toggle != toggled_back:
-                print("✓ Space key toggles theme")
-            else:
-                print("✗ Space key did not toggle theme")
-            
-            # Test keyboard navigation (Enter key)
-            print("\n8. Testing keyboard navigation (Enter key)...")
-            await page.keyboard.press("Enter")
-            await page.wait_for_timeout(500)
-            
-            enter_toggle = await body.evaluate("el => el.classList.contains('light-theme')")
-            if enter_toggle != space_toggle:
-                print("✓ Enter key toggles theme")
-            else:
-                print("✗ Enter key did not toggle theme")
-            
-            # Test localStorage persistence
-            print("\n9. Testing theme persistence with localStorage...")
-            current_theme = await body.evaluate("el => el.classList.contains('light-theme')")
-            stored_theme = await page.evaluate("() => localStorage.getItem('theme')")
-            expected_theme = 'light' if current_theme else 'dark'
-            
-            if stored_theme == expected_theme:
-                print(f"✓ Theme stored in localStorage: {stored_theme}")
-            else:
-                print(f"✗ localStorage mismatch. Stored: {stored_theme}, Expected: {expected_theme}")
-            
-            # Test theme persistence after reload
-            print("\n10. Testing theme persistence after page reload...")
-            await page.reload(wait_until="networkidle")
-            await page.wait_for_timeout(500)
-            
-            reloaded_theme = await body.evaluate("el => el.classList.contains('light-theme')")
-            if reloaded_theme == current_theme:
-                print("✓ Theme persisted after reload")
-            else:
-                print("✗ Theme did not persist after reload")
-            
-            # Test CSS transitions and animations
-            print("\n11. Testing CSS transitions on icons...")
-            sun_icon = page.locator(".sun-icon")
-            moon_icon = page.locator(".moon-icon")
-            
-            # Both icons exist in DOM but visibility is controlled by opacity
-            sun_count = await sun_icon.count()
-            moon_count = await moon_icon.count()
-            
-            if sun_count > 0 and moon_count > 0:
-                print("✓ Both sun and moon icons are present in DOM")
-            else:
-                print(f"✗ Missing icons. Sun: {sun_count}, Moon: {moon_count}")
-            
-            # Check icon visibility based on theme via opacity
-            sun_opacity = await sun_icon.evaluate("el => window.getComputedStyle(el).opacity")
-            moon_opacity = await moon_icon.evaluate("el => window.getComputedStyle(el).opacity")
-            print(f"  Sun icon opacity: {sun_opacity}")
-            print(f"  Moon icon opacity: {moon_opacity}")
-            
-            # Verify one is visible (opacity 1) and one is hidden (opacity 0)
-            if (sun_opacity == "1" and moon_opacity == "0") or (sun_opacity == "0" and moon_opacity == "1"):
-                print("✓ Icons have correct opacity for theme")
-            else:
-                print(f"⚠ Icon opacity may be transitioning")
-            
-            # Test hover effect
-            print("\n12. Testing hover effect...")
-            await theme_button.hover()
-            await page.wait_for_timeout(300)
-            print("✓ Button hover effect applied")
-            
-            print("\n=== All Theme Toggle Tests Passed! ===\n")
-            
-            # Keep browser open for visual inspection
-            print("Browser will close in 3 seconds...")
+        # Find the theme toggle button
+        out("\n2. Checking if theme toggle button exists...\n")
+        await expect(theme_button).to_be_visible(timeout=5000)
+        out("✓ Theme toggle button is visible\n")
+        
+        # Check initial state (should be dark theme by default)
+        out("\n3. Checking initial theme state...\n")
+        has_light_class = (await snapshot(page))["hasLight"]
+        if has_light_class:
+            out("✓ Initial theme: Light mode\n")
+        else:
+            out("✓ Initial theme: Dark mode\n")
+        
+        # Test clicking the button
+        out("\n4. Testing theme toggle by clicking...\n")
+        initial_theme = has_light_class
+        await theme_button.click()
+        new_light_class = not initial_theme
+        await expect_theme(body, new_light_class)
+        out("✓ Theme toggled successfully\n")
+        out(f"  Theme changed from {'light' if initial_theme else 'dark'} to {'light' if new_light_class else 'dark'}\n")
+        
+        # Toggle back
+        out("\n5. Toggling theme back...\n")
+        await theme_button.click()
+        toggled_back = initial_theme
+        await expect_theme(body, toggled_back)
+        out("✓ Theme toggled back successfully\n")
+        
+        # Test keyboard navigation (Space key)
+        out("\n6. Testing keyboard navigation (Space key)...\n")
+        await theme_button.focus()
+        await page.keyboard.press("Space")
+        space_toggle = not toggled_back
+        await expect_theme(body, space_toggle)
+        out("✓ Space key toggles theme\n")
+        
+        # Test keyboard navigation (Enter key)
+        out("\n7. Testing keyboard navigation (Enter key)...\n")
+        await page.keyboard.press("Enter")
+        enter_toggle = not space_toggle
+        await expect_theme(body, enter_toggle)
+        out("✓ Enter key toggles theme\n")
+        
+        # Test localStorage persistence
+        out("\n8. Testing theme persistence with localStorage...\n")
+        snap = await snapshot(page)
+        current_theme = snap["hasLight"]
+        stored_theme = snap["storedTheme"]
+        expected_theme = 'light' if current_theme else 'dark'
+        
+        if stored_theme == expected_theme:
+            out(f"✓ Theme stored in localStorage: {stored_theme}\n")
+        else:
+            out(f"✗ localStorage mismatch. Stored: {stored_theme}, Expected: {expected_theme}\n")
+        
+        # Test theme persistence after reload
+        out("\n9. Testing theme persistence after page reload...\n")
+        await page.reload(wait_until="domcontentloaded")
+        await expect(theme_button).to_be_visible()
+        await expect_theme(body, current_theme)
+        out("✓ Theme persisted after reload\n")
+        
+        # Test CSS transitions and animations
+        out("\n10. Testing CSS transitions on icons...\n")
+        # Both icons exist in DOM but visibility is controlled by opacity
+        icons = await icon_state(page, *(("1", "0") if current_theme else ("0", "1")))
+        
+        if icons["sc"] > 0 and icons["mc"] > 0:
+            out("✓ Both sun and moon icons are present in DOM\n")
+            out(f"  Sun icon opacity: {icons['so']}\n")
+            out(f"  Moon icon opacity: {icons['mo']}\n")
+            out("✓ Icons have correct opacity for theme\n")
+        else:
+            out(f"✗ Missing icons. Sun: {icons['sc']}, Moon: {icons['mc']}\n")
+        
+        # Test hover effect
+        out("\n11. Testing hover effect...\n")
+        # The earlier clicks left the pointer on the button; move it away and let
+        # the background transition finish so base_bg is the un-hovered colour
+        await page.mouse.move(0, 0)
+        await theme_button.evaluate(
+            "el => Promise.all(el.getAnimations().map(a => a.finished))"
+        )
+        base_bg = await theme_button.evaluate("el => window.getComputedStyle(el).backgroundColor")
+        await theme_button.hover()
+        await expect(theme_button).not_to_have_css("background-color", base_bg, timeout=1000)
+        out("✓ Button hover effect applied\n")
+        
+        out("\n=== All Theme Toggle Tests Passed! ===\n\n")
+        
+        # Keep browser open for visual inspection
+        if not HEADLESS:
+            out("Browser will close in 3 seconds...\n")
             await page.wait_for_timeout(3000)
-            
-            await browser.close()
-            return True
-            
-        except Exception as e:
-            print(f"\n✗ Test failed with error: {e}")
-            await browser.close()
-            return False
+        
+        return True
+        
+    except Exception as e:
+        out(f"\n✗ Test failed with error: {e}\n")
+        return False
+    finally:
+        await context.close()
+        sys.stdout.write(log.getvalue())
+        sys.stdout.flush()
 
 
-async def test_theme_visual_appearance():
+async def test_theme_visual_appearance(context: BrowserContext) -> bool:
     """Test visual appearance of light and dark themes"""
-    print("\n=== Testing Theme Visual Appearance ===\n")
+    log = io.StringIO()
+    out = log.write
+    out("\n=== Testing Theme Visual Appearance ===\n\n")
     
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)
-        page = await browser.new_page()
+    page = await context.new_page()
+    theme_button = page.locator("#themeToggle")
+    body = page.locator("body")
+    
+    try:
+        await page.goto("http://localhost:8000", wait_until="domcontentloaded")
+        await expect(theme_button).to_be_visible()
         
-        try:
-            await page.goto("http://localhost:8000", wait_until="networkidle")
-            
-            # Get dark theme colors
-            print("1. Capturing dark theme colors...")
-            body = page.locator("body")
-            dark_bg = await body.evaluate("el => window.getComputedStyle(el).backgroundColor")
-            print(f"✓ Dark theme background: {dark_bg}")
-            
-            # Switch to light theme
-            print("\n2. Switching to light theme...")
-            theme_button = page.locator("#themeToggle")
-            
-            # Ensure we're in dark mode first
-            has_light = await body.evaluate("el => el.classList.contains('light-theme')")
-            if has_light:
-                await theme_button.click()
-                await page.wait_for_timeout(500)
-            
-            # Now toggle to light
-            await theme_button.click()
-            await page.wait_for_timeout(500)
-            
-            light_bg = await body.evaluate("el => window.getComputedStyle(el).backgroundColor")
-            print(f"✓ Light theme background: {light_bg}")
-            
-            # Verify themes are different
-            if dark_bg != light_bg:
-                print("✓ Themes have different background colors")
-            else:
-                print("✗ Themes have same background color")
-                return False
-            
-            # Take screenshots
-            print("\n3. Taking screenshots...")
-            await page.screenshot(path="frontend/tests/theme-light.png")
-            print("✓ Light theme screenshot saved: frontend/tests/theme-light.png")
-            
+        # main() seeds the light theme; only click when the context started elsewhere
+        out("1. Capturing light theme colors...\n")
+        has_light = await body.evaluate("el => el.classList.contains('light-theme')")
+        if not has_light:
             await theme_button.click()
-            await page.wait_for_timeout(500)
-            await page.screenshot(path="frontend/tests/theme-dark.png")
-            print("✓ Dark theme screenshot saved: frontend/tests/theme-dark.png")
-            
-            print("\n=== Visual Appearance Tests Passed! ===\n")
-            
+        await expect_theme(body, True)
+        light_bg = await body.evaluate("el => window.getComputedStyle(el).backgroundColor")
+        out(f"✓ Light theme background: {light_bg}\n")
+        
+        if SCREENSHOTS:
+            await page.screenshot(path="frontend/tests/theme-light.jpg", **SCREENSHOT_OPTIONS)
+            out("✓ Light theme screenshot saved: frontend/tests/theme-light.jpg\n")
+        
+        # Switch to dark theme
+        out("\n2. Switching to dark theme...\n")
+        await theme_button.click()
+        await expect_theme(body, False)
+        await expect(body).not_to_have_css("background-color", light_bg)
+        
+        dark_bg = await body.evaluate("el => window.getComputedStyle(el).backgroundColor")
+        out(f"✓ Dark theme background: {dark_bg}\n")
+        out("✓ Themes have different background colors\n")
+        
+        if SCREENSHOTS:
+            await page.screenshot(path="frontend/tests/theme-dark.jpg", **SCREENSHOT_OPTIONS)
+            out("✓ Dark theme screenshot saved: frontend/tests/theme-dark.jpg\n")
+        
+        out("\n=== Visual Appearance Tests Passed! ===\n\n")
+        
+        if not HEADLESS:
             await page.wait_for_timeout(2000)
-            await browser.close()
-            return True
-            
-        except Exception as e:
-            print(f"\n✗ Visual test failed with error: {e}")
-            await browser.close()
-            return False
+        return True
+        
+    except Exception as e:
+        out(f"\n✗ Visual test failed with error: {e}\n")
+        return False
+    finally:
+        await context.close()
+        sys.stdout.write(log.getvalue())
+        sys.stdout.flush()
 
 
-async def test_footer_presence():
+async def test_footer_presence(context: BrowserContext) -> bool:
     """Test that the footer is present and properly styled"""
-    print("\n=== Testing Footer Presence and Styling ===\n")
+    log = io.StringIO()
+    out = log.write
+    out("\n=== Testing Footer Presence and Styling ===\n\n")
     
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)
-        page = await browser.new_page()
+    page = await context.new_page()
+    theme_button = page.locator("#themeToggle")
+    body = page.locator("body")
+    footer = page.locator(".app-footer")
+    claude_brand = page.locator(".claude-brand")
+    
+    try:
+        await page.goto("http://localhost:8000", wait_until="domcontentloaded")
+        await expect(theme_button).to_be_visible()
         
-        try:
-            await page.goto("http://localhost:8000", wait_until="networkidle")
-            
-            # Check if footer exists
-            print("1. Checking if footer exists...")
-            footer = page.locator(".app-footer")
-            await expect(footer).to_be_visible(timeout=5000)
-            print("✓ Footer is visible")
-            
-            # Check footer text content
-            print("\n2. Checking footer content...")
-            footer_text = await footer.text_content()
-            if "All rights reserved" in footer_text and "Claude" in footer_text:
-                print(f"✓ Footer contains correct text: {footer_text.strip()}")
-            else:
-                print(f"✗ Footer text incorrect: {footer_text}")
-                return False
-            
-            # Check footer positioning
-            print("\n3. Checking footer positioning...")
-            footer_position = await footer.evaluate("el => window.getComputedStyle(el).position")
-            if footer_position == "fixed":
-                print("✓ Footer has fixed positioning")
-            else:
-                print(f"✗ Footer position is {footer_position}, expected fixed")
-                return False
-            
-            # Check footer is at bottom-left
-            footer_bottom = await footer.evaluate("el => window.getComputedStyle(el).bottom")
-            footer_left = await footer.evaluate("el => window.getComputedStyle(el).left")
-            print(f"  Bottom: {footer_bottom}, Left: {footer_left}")
-            if footer_bottom == "0px" and footer_left == "0px":
-                print("✓ Footer positioned at bottom-left")
-            else:
-                print(f"⚠ Footer position may be different")
-            
-            # Check Claude brand color
-            print("\n4. Checking Claude brand styling...")
-            claude_brand = page.locator(".claude-brand")
-            await expect(claude_brand).to_be_visible()
-            claude_color = await claude_brand.evaluate("el => window.getComputedStyle(el).color")
-            print(f"✓ Claude brand color: {claude_color}")
-            
-            # Check font size
-            print("\n5. Checking footer font size...")
-            font_size = await footer.evaluate("el => window.getComputedStyle(el).fontSize")
-            print(f"✓ Footer font size: {font_size}")
-            
-            # Test footer visibility in both themes
-            print("\n6. Testing footer visibility in both themes...")
-            theme_button = page.locator("#themeToggle")
-            
-            # Switch to light theme
-            await theme_button.click()
-            await page.wait_for_timeout(500)
-            await expect(footer).to_be_visible()
-            print("✓ Footer visible in light theme")
-            
-            # Switch back to dark theme
-            await theme_button.click()
-            await page.wait_for_timeout(500)
-            await expect(footer).to_be_visible()
-            print("✓ Footer visible in dark theme")
-            
-            print("\n=== Footer Tests Passed! ===\n")
-            
+        # Check if footer exists
+        out("1. Checking if footer exists...\n")
+        await expect(footer).to_be_visible(timeout=5000)
+        out("✓ Footer is visible\n")
+        
+        # Check footer positioning
+        out("\n2. Checking footer positioning...\n")
+        await expect(footer).to_have_css("position", "fixed")
+        out("✓ Footer has fixed positioning\n")
+        
+        # Check footer is at bottom-left
+        await expect(footer).to_have_css("bottom", "0px")
+        await expect(footer).to_have_css("left", "0px")
+        out("✓ Footer positioned at bottom-left\n")
+        
+        # Check Claude brand color (--primary-color)
+        out("\n3. Checking Claude brand styling...\n")
+        await expect(claude_brand).to_be_visible()
+        await expect(claude_brand).to_have_css("color", "rgb(37, 99, 235)")
+        out("✓ Claude brand color: rgb(37, 99, 235)\n")
+        
+        # Check font size (0.75rem)
+        out("\n4. Checking footer font size...\n")
+        await expect(footer).to_have_css("font-size", "12px")
+        out("✓ Footer font size: 12px\n")
+        
+        # Test footer visibility in both themes
+        out("\n5. Testing footer visibility in both themes...\n")
+        
+        # Switch to light theme
+        await theme_button.click()
+        await expect_theme(body, True)
+        await expect(footer).to_be_visible()
+        out("✓ Footer visible in light theme\n")
+        
+        # Switch back to dark theme
+        await theme_button.click()
+        await expect_theme(body, False)
+        await expect(footer).to_be_visible()
+        out("✓ Footer visible in dark theme\n")
+        
+        out("\n=== Footer Tests Passed! ===\n\n")
+        
+        if not HEADLESS:
             await page.wait_for_timeout(2000)
-            await browser.close()
-            return True
-            
-        except Exception as e:
-            print(f"\n✗ Footer test failed with error: {e}")
-            await browser.close()
-            return False
+        return True
+        
+    except Exception as e:
+        out(f"\n✗ Footer test failed with error: {e}\n")
+        return False
+    finally:
+        await context.close()
+        sys.stdout.write(log.getvalue())
+        sys.stdout.flush()
 
 
 async def main():
@@ -317,14 +386,29 @@ async def main():
     print("THEME TOGGLE E2E TEST SUITE")
     print("="*60)
     
-    # Test 1: Functionality
-    result1 = await test_theme_toggle_button()
-    
-    # Test 2: Visual appearance
-    result2 = await test_theme_visual_appearance()
-    
-    # Test 3: Footer presence and styling
-    result3 = await test_footer_presence()
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(
+            headless=HEADLESS,
+            args=["--disable-gpu", "--no-sandbox"] if HEADLESS else [],
+        )
+        
+        try:
+            # Tests are independent, so run them side by side in separate contexts
+            ctxs = await asyncio.gather(
+                browser.new_context(),
+                browser.new_context(storage_state=theme_storage_state("light")),
+                browser.new_context(),
+            )
+            results = await asyncio.gather(
+                test_theme_toggle_button(ctxs[0]),
+                test_theme_visual_appearance(ctxs[1]),
+                test_footer_presence(ctxs[2]),
+                test_static_presence(),
+                return_exceptions=True,
+            )
+            result1, result2, result3, result4 = (result is True for result in results)
+        finally:
+            await browser.close()
     
     # Summary
     print("\n" + "="*60)
@@ -333,8 +417,9 @@ async def main():
     print(f"Functionality Tests: {'✓ PASSED' if result1 else '✗ FAILED'}")
     print(f"Visual Tests: {'✓ PASSED' if result2 else '✗ FAILED'}")
     print(f"Footer Tests: {'✓ PASSED' if result3 else '✗ FAILED'}")
+    print(f"Static Markup Tests: {'✓ PASSED' if result4 else '✗ FAILED'}")
     
-    if result1 and result2 and result3:
+    if result1 and result2 and result3 and result4:
         print("\n🎉 All tests passed successfully!")
         return 0
     else:
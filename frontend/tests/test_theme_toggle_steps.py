@@ -0,0 +1,60 @@
+"""
+Pytest versions of the theme toggle interaction checks.
+
+Each step of test_theme_toggle_button runs as its own test against a fresh
+context, so one failure does not hide the rest and pytest-xdist can spread
+them across workers:
+
+    pytest frontend/tests/test_theme_toggle_steps.py -n 4
+"""
+
+import pytest
+from playwright.async_api import expect
+
+from test_theme_toggle import expect_theme
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+@pytest.mark.parametrize("action", ["click", "Space", "Enter"])
+async def test_toggle_switches_to_light(page, action):
+    """Click, Space and Enter each switch the default dark theme to light"""
+    theme_button = page.locator("#themeToggle")
+    body = page.locator("body")
+
+    await expect_theme(body, False)
+    if action == "click":
+        await theme_button.click()
+    else:
+        await theme_button.press(action)
+    await expect_theme(body, True)
+
+
+async def test_toggle_back_restores_dark(page):
+    """A second toggle returns to the dark theme"""
+    theme_button = page.locator("#themeToggle")
+    body = page.locator("body")
+
+    await theme_button.click()
+    await expect_theme(body, True)
+    await theme_button.click()
+    await expect_theme(body, False)
+
+
+async def test_localstorage_persistence(page):
+    """The selected theme is written to localStorage"""
+    await page.locator("#themeToggle").click()
+    await expect_theme(page.locator("body"), True)
+
+    assert await page.evaluate("() => localStorage.getItem('theme')") == "light"
+
+
+async def test_reload_persistence(page):
+    """The selected theme survives a page reload"""
+    body = page.locator("body")
+
+    await page.locator("#themeToggle").click()
+    await expect_theme(body, True)
+    await page.reload(wait_until="domcontentloaded")
+    await expect(page.locator("#themeToggle")).to_be_visible()
+    await expect_theme(body, True)
@@ -4,398 +4,477 @@ E2E Tests for UI Components and Layout
 Tests sidebar, collapsibles, responsive design, and visual elements.
 """
 
+import argparse
 import asyncio
+import json
+import os
+import httpx
 from playwright.async_api import async_playwright, expect
 
+# Headless by default; PW_HEADED=1 shows the browser window
+HEADED = os.environ.get("PW_HEADED") == "1"
 
-async def test_sidebar_collapsibles():
+# Hold each finished test briefly in headed runs (PW_PAUSE, see TESTING.md)
+PAUSE_ON_CLOSE = HEADED and os.environ.get("PW_PAUSE", "1") == "1"
+
+# Canned API payloads; these tests exercise the frontend, not retrieval or the LLM
+STUB_COURSES = {"total_courses": 3, "course_titles": ["Course A", "Course B", "Course C"]}
+STUB_QUERY = {
+    "answer": "This is a canned assistant reply used by the UI tests.",
+    "sources": ["Course A - Lesson 1"],
+    "session_id": "ui-test-session",
+}
+
+
+async def stub_api(context, query=False):
+    """Answer /api/courses (and optionally /api/query) locally instead of hitting the backend"""
+    async def fulfill(route, payload):
+        await route.fulfill(status=200, content_type="application/json", body=json.dumps(payload))
+
+    await context.route("**/api/courses", lambda route: fulfill(route, STUB_COURSES))
+    if query:
+        await context.route("**/api/query", lambda route: fulfill(route, STUB_QUERY))
+
+
+# Images and fonts play no part in DOM assertions
+BLOCKED_ASSETS = "**/*.{png,jpg,jpeg,gif,svg,webp,woff,woff2,ttf}"
+
+
+async def new_test_context(browser, **options):
+    """Context tuned for DOM assertions: no animations, fixed viewport, no images or fonts"""
+    options.setdefault("viewport", {"width": 1280, "height": 720})
+    context = await browser.new_context(reduced_motion="reduce", **options)
+    await context.route(BLOCKED_ASSETS, lambda route: route.abort())
+    return context
+
+
+async def test_sidebar_collapsibles(browser):
     """Test collapsible sections in sidebar"""
     print("\n=== Testing Sidebar Collapsibles ===\n")
     
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)
-        page = await browser.new_page()
+    context = await new_test_context(browser)
+    await stub_api(context)
+    page = await context.new_page()
+    
+    try:
+        await page.goto("http://localhost:8000", wait_until="domcontentloaded")
+        await expect(page.locator("#chatInput")).to_be_visible()
         
-        try:
-            await page.goto("http://localhost:8000", wait_until="networkidle")
-            await page.wait_for_timeout(1000)
-            
-            # Test course stats collapsible
-            print("1. Testing course stats collapsible...")
-            stats_summary = page.locator(".stats-header")
-            await expect(stats_summary).to_be_visible()
-            print("✓ Stats header visible")
-            
-            # Check if initially open or closed
-            stats_details = page.locator(".stats-collapsible")
-            is_open = await stats_details.get_attribute("open")
-            print(f"  Initial state: {'open' if is_open else 'closed'}")
-            
-            # Click to toggle
-            await stats_summary.click()
-            await page.wait_for_timeout(300)
-            new_state = await stats_details.get_attribute("open")
-            assert new_state != is_open  # State should change
-            print("✓ Stats collapsible toggles correctly")
-            
-            # Test suggested questions collapsible
-            print("\n2. Testing suggested questions collapsible...")
-            suggested_summary = page.locator(".suggested-header")
-            await expect(suggested_summary).to_be_visible()
-            print("✓ Suggested questions header visible")
-            
-            suggested_details = page.locator(".suggested-collapsible")
-            is_open = await suggested_details.get_attribute("open")
-            print(f"  Initial state: {'open' if is_open else 'closed'}")
-            
-            # Click to toggle
-            await suggested_summary.click()
-            await page.wait_for_timeout(300)
-            new_state = await suggested_details.get_attribute("open")
-            assert new_state != is_open
-            print("✓ Suggested questions collapsible toggles correctly")
-            
-            print("\n=== Sidebar Collapsibles Test Passed! ===\n")
+        # Clicking a <summary> toggles its <details> synchronously, so one
+        # evaluate can click and report the before/after state together
+        toggle_js = """(sel) => {
+            const d = document.querySelector(sel);
+            const before = d.hasAttribute('open');
+            d.querySelector('summary').click();
+            return { before, after: d.hasAttribute('open') };
+        }"""
+        
+        sections = [
+            ("course stats", ".stats-header", ".stats-collapsible"),
+            ("suggested questions", ".suggested-header", ".suggested-collapsible"),
+        ]
+        for step, (label, summary_selector, details_selector) in enumerate(sections, 1):
+            prefix = "\n" if step > 1 else ""
+            print(f"{prefix}{step}. Testing {label} collapsible...")
+            await expect(page.locator(summary_selector)).to_be_visible()
+            print(f"✓ {label.capitalize()} header visible")
+            
+            toggled = await page.evaluate(toggle_js, details_selector)
+            print(f"  Initial state: {'open' if toggled['before'] else 'closed'}")
+            assert toggled["before"] != toggled["after"], f"{label} collapsible did not toggle"
+            print(f"✓ {label.capitalize()} collapsible toggles correctly")
+        
+        print("\n=== Sidebar Collapsibles Test Passed! ===\n")
+        if PAUSE_ON_CLOSE:
             await page.wait_for_timeout(2000)
-            await browser.close()
-            return True
-            
-        except Exception as e:
-            print(f"\n✗ Test failed with error: {e}")
-            await browser.close()
-            return False
+        return True
+        
+    except Exception as e:
+        print(f"\n✗ Test failed with error: {e}")
+        return False
+    finally:
+        await context.close()
 
 
-async def test_layout_structure():
-    """Test main layout structure and elements"""
+async def test_layout_structure_static():
+    """Test layout markup straight from the served HTML, without a browser"""
+    # Imported here so the browser tests don't depend on the HTML parser
+    from selectolax.lexbor import LexborHTMLParser
+    
+    print("\n=== Testing Layout Structure (static) ===\n")
+    
+    try:
+        print("1. Fetching page HTML...")
+        async with httpx.AsyncClient() as client:
+            response = await client.get("http://localhost:8000", timeout=5)
+        response.raise_for_status()
+        tree = LexborHTMLParser(response.text)
+        
+        print("\n2. Checking header text...")
+        title = tree.css_first("header h1")
+        assert title is not None, "Header title not found"
+        assert "Course Materials Assistant" in title.text()
+        print(f"✓ Header title: {title.text()}")
+        subtitle = tree.css_first("header .subtitle")
+        if subtitle is not None:
+            print(f"✓ Subtitle: {subtitle.text()}")
+        
+        print("\n3. Checking footer text...")
+        footer = tree.css_first(".app-footer")
+        assert footer is not None, "Footer not found"
+        assert "Claude" in footer.text()
+        print(f"✓ Footer text: {footer.text().strip()}")
+        
+        print("\n4. Checking chat input placeholder...")
+        chat_input = tree.css_first("#chatInput")
+        assert chat_input is not None, "Chat input not found"
+        placeholder = chat_input.attributes.get("placeholder")
+        assert placeholder, "Chat input has no placeholder"
+        print(f"✓ Input placeholder: {placeholder}")
+        
+        print("\n=== Static Layout Structure Test Passed! ===\n")
+        return True
+        
+    except Exception as e:
+        print(f"\n✗ Test failed with error: {e}")
+        return False
+
+
+async def test_layout_structure(browser):
+    """Test that the main layout sections render visibly"""
     print("\n=== Testing Layout Structure ===\n")
     
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)
-        page = await browser.new_page()
+    context = await new_test_context(browser)
+    await stub_api(context)
+    page = await context.new_page()
+    
+    try:
+        await page.goto("http://localhost:8000", wait_until="domcontentloaded")
+        await expect(page.locator("#chatInput")).to_be_visible()
         
-        try:
-            await page.goto("http://localhost:8000", wait_until="networkidle")
-            await page.wait_for_timeout(1000)
-            
-            print("1. Checking header elements...")
-            header = page.locator("header")
-            await expect(header).to_be_visible()
-            
-            title = page.locator("header h1")
-            title_text = await title.text_content()
-            assert "Course Materials Assistant" in title_text
-            print(f"✓ Header title: {title_text}")
-            
-            subtitle = page.locator("header .subtitle")
-            subtitle_text = await subtitle.text_content()
-            print(f"✓ Subtitle: {subtitle_text}")
-            
-            print("\n2. Checking main layout sections...")
-            sidebar = page.locator(".sidebar")
-            await expect(sidebar).to_be_visible()
-            print("✓ Sidebar visible")
-            
-            chat_main = page.locator(".chat-main")
-            await expect(chat_main).to_be_visible()
-            print("✓ Main chat area visible")
-            
-            print("\n3. Checking footer...")
-            footer = page.locator(".app-footer")
-            await expect(footer).to_be_visible()
-            footer_text = await footer.text_content()
-            assert "Claude" in footer_text
-            print(f"✓ Footer visible: {footer_text.strip()}")
-            
-            print("\n4. Checking chat input area...")
-            chat_input = page.locator("#chatInput")
-            await expect(chat_input).to_be_visible()
-            
-            placeholder = await chat_input.get_attribute("placeholder")
-            print(f"✓ Input placeholder: {placeholder}")
-            
-            send_button = page.locator("#sendButton")
-            await expect(send_button).to_be_visible()
-            print("✓ Send button visible")
-            
-            print("\n=== Layout Structure Test Passed! ===\n")
+        # Text and attribute content is covered by test_layout_structure_static;
+        # only rendered visibility needs the browser here
+        print("1. Checking header elements...")
+        header = page.locator("header")
+        await expect(header).to_be_visible()
+        print("✓ Header visible")
+        
+        print("\n2. Checking main layout sections...")
+        sidebar = page.locator(".sidebar")
+        await expect(sidebar).to_be_visible()
+        print("✓ Sidebar visible")
+        
+        chat_main = page.locator(".chat-main")
+        await expect(chat_main).to_be_visible()
+        print("✓ Main chat area visible")
+        
+        print("\n3. Checking footer...")
+        footer = page.locator(".app-footer")
+        await expect(footer).to_be_visible()
+        print("✓ Footer visible")
+        
+        print("\n4. Checking chat input area...")
+        chat_input = page.locator("#chatInput")
+        await expect(chat_input).to_be_visible()
+        print("✓ Chat input visible")
+        
+        send_button = page.locator("#sendButton")
+        await expect(send_button).to_be_visible()
+        print("✓ Send button visible")
+        
+        print("\n=== Layout Structure Test Passed! ===\n")
+        if PAUSE_ON_CLOSE:
             await page.wait_for_timeout(2000)
-            await browser.close()
-            return True
-            
-        except Exception as e:
-            print(f"\n✗ Test failed with error: {e}")
-            await browser.close()
-            return False
+        return True
+        
+    except Exception as e:
+        print(f"\n✗ Test failed with error: {e}")
+        return False
+    finally:
+        await context.close()
+
 
+async def _probe_viewport(browser, label, width, height, required_selectors):
+    """Load the app at one viewport size and check the given elements are visible"""
+    context = await new_test_context(browser, viewport={"width": width, "height": height})
+    try:
+        await stub_api(context)
+        page = await context.new_page()
+        await page.goto("http://localhost:8000", wait_until="domcontentloaded")
+        for selector in required_selectors:
+            await expect(page.locator(selector)).to_be_visible()
+        print(f"✓ {label} ({width}x{height}): {', '.join(required_selectors)} visible")
+        if PAUSE_ON_CLOSE:
+            await page.wait_for_timeout(2000)
+    finally:
+        await context.close()
 
-async def test_responsive_design():
+
+async def test_responsive_design(browser):
     """Test responsive design at different viewport sizes"""
     print("\n=== Testing Responsive Design ===\n")
     
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)
+    try:
+        # Each size gets its own context, so the three probes run side by side
+        print("Testing desktop, tablet and mobile viewports...")
+        await asyncio.gather(
+            _probe_viewport(browser, "Desktop", 1920, 1080, [".sidebar"]),
+            _probe_viewport(browser, "Tablet", 768, 1024, ["#chatInput"]),
+            _probe_viewport(browser, "Mobile", 375, 667, ["#chatInput", "#sendButton"]),
+        )
         
-        try:
-            # Test desktop size
-            print("1. Testing desktop viewport (1920x1080)...")
-            page = await browser.new_page(viewport={"width": 1920, "height": 1080})
-            await page.goto("http://localhost:8000", wait_until="networkidle")
-            await page.wait_for_timeout(1000)
-            
-            sidebar = page.locator(".sidebar")
-            await expect(sidebar).to_be_visible()
-            print("✓ Sidebar visible on desktop")
-            
-            await page.close()
-            
-            # Test tablet size
-            print("\n2. Testing tablet viewport (768x1024)...")
-            page = await browser.new_page(viewport={"width": 768, "height": 1024})
-            await page.goto("http://localhost:8000", wait_until="networkidle")
-            await page.wait_for_timeout(1000)
-            
-            # Check layout still functional
-            chat_input = page.locator("#chatInput")
-            await expect(chat_input).to_be_visible()
-            print("✓ Layout functional on tablet")
-            
-            await page.close()
-            
-            # Test mobile size
-            print("\n3. Testing mobile viewport (375x667)...")
-            page = await browser.new_page(viewport={"width": 375, "height": 667})
-            await page.goto("http://localhost:8000", wait_until="networkidle")
-            await page.wait_for_timeout(1000)
-            
-            # Check essential elements still visible
-            chat_input = page.locator("#chatInput")
-            await expect(chat_input).to_be_visible()
-            print("✓ Chat input visible on mobile")
-            
-            send_button = page.locator("#sendButton")
-            await expect(send_button).to_be_visible()
-            print("✓ Send button visible on mobile")
-            
-            await page.close()
-            
-            print("\n=== Responsive Design Test Passed! ===\n")
-            await page.wait_for_timeout(2000)
-            await browser.close()
-            return True
-            
-        except Exception as e:
-            print(f"\n✗ Test failed with error: {e}")
-            await browser.close()
-            return False
+        print("\n=== Responsive Design Test Passed! ===\n")
+        return True
+        
+    except Exception as e:
+        print(f"\n✗ Test failed with error: {e}")
+        return False
 
 
-async def test_message_display():
+async def test_message_display(browser):
     """Test message display formatting and sources"""
     print("\n=== Testing Message Display ===\n")
     
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)
-        page = await browser.new_page()
+    context = await new_test_context(browser)
+    await stub_api(context, query=True)
+    page = await context.new_page()
+    
+    try:
+        await page.goto("http://localhost:8000", wait_until="domcontentloaded")
+        await expect(page.locator("#chatInput")).to_be_visible()
         
-        try:
-            await page.goto("http://localhost:8000", wait_until="networkidle")
-            await page.wait_for_timeout(1000)
-            
-            # Send a message
-            print("1. Sending message...")
-            await page.fill("#chatInput", "What is Python?")
-            await page.click("#sendButton")
-            
-            # Wait for user message
-            await page.wait_for_selector(".message.user", timeout=5000)
-            print("✓ User message displayed")
-            
-            # Wait for assistant response
-            await page.wait_for_timeout(3000)
-            
-            # Check message structure
-            print("\n2. Checking message structure...")
-            user_messages = page.locator(".message.user")
-            user_count = await user_messages.count()
-            print(f"✓ User messages: {user_count}")
-            
-            assistant_messages = page.locator(".message.assistant")
-            assistant_count = await assistant_messages.count()
-            print(f"✓ Assistant messages: {assistant_count}")
-            
-            # Check for message content
-            print("\n3. Checking message content...")
-            last_assistant = page.locator(".message.assistant").last
-            message_content = last_assistant.locator(".message-content")
-            await expect(message_content).to_be_visible()
-            
-            content_text = await message_content.text_content()
-            print(f"✓ Response content length: {len(content_text)} characters")
-            assert len(content_text) > 10
-            
-            # Check if sources are displayed
-            print("\n4. Checking for sources...")
-            sources = last_assistant.locator(".sources")
-            sources_count = await sources.count()
-            if sources_count > 0:
-                print(f"✓ Sources section found: {sources_count}")
-            else:
-                print("  No sources in this response")
-            
-            print("\n=== Message Display Test Passed! ===\n")
+        # Send a message
+        print("1. Sending message...")
+        await page.fill("#chatInput", "What is Python?")
+        await page.click("#sendButton")
+        
+        # Wait until the last assistant message holds real reply text
+        await page.wait_for_function("""() => {
+            const m = document.querySelectorAll('.message.assistant:not(:has(.loading))');
+            return m.length > 1 &&
+                (m[m.length - 1].querySelector('.message-content')?.textContent.length ?? 0) > 10;
+        }""", timeout=10000)
+        
+        # Read every probe below in one round-trip
+        state = await page.evaluate("""() => {
+            const assistants = document.querySelectorAll('.message.assistant');
+            const last = assistants[assistants.length - 1];
+            return {
+                userCount: document.querySelectorAll('.message.user').length,
+                assistantCount: assistants.length,
+                lastContent: last.querySelector('.message-content').textContent,
+                hasSources: !!last.querySelector('.sources-collapsible')
+            };
+        }""")
+        
+        # Check message structure
+        print("\n2. Checking message structure...")
+        assert state["userCount"] >= 1
+        print(f"✓ User messages: {state['userCount']}")
+        print(f"✓ Assistant messages: {state['assistantCount']}")
+        
+        # Check for message content
+        print("\n3. Checking message content...")
+        content_text = state["lastContent"]
+        print(f"✓ Response content length: {len(content_text)} characters")
+        assert len(content_text) > 10
+        
+        # Check if sources are displayed
+        print("\n4. Checking for sources...")
+        if state["hasSources"]:
+            print("✓ Sources section found")
+        else:
+            print("  No sources in this response")
+        
+        print("\n=== Message Display Test Passed! ===\n")
+        if PAUSE_ON_CLOSE:
             await page.wait_for_timeout(2000)
-            await browser.close()
-            return True
-            
-        except Exception as e:
-            print(f"\n✗ Test failed with error: {e}")
-            await browser.close()
-            return False
+        return True
+        
+    except Exception as e:
+        print(f"\n✗ Test failed with error: {e}")
+        return False
+    finally:
+        await context.close()
 
 
-async def test_scroll_behavior():
+async def test_scroll_behavior(browser):
     """Test chat scrolls to bottom on new messages"""
     print("\n=== Testing Scroll Behavior ===\n")
     
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)
-        page = await browser.new_page()
+    context = await new_test_context(browser)
+    await stub_api(context, query=True)
+    page = await context.new_page()
+    
+    try:
+        await page.goto("http://localhost:8000", wait_until="domcontentloaded")
+        await expect(page.locator("#chatInput")).to_be_visible()
         
-        try:
-            await page.goto("http://localhost:8000", wait_until="networkidle")
-            await page.wait_for_timeout(1000)
-            
-            # Send multiple messages to fill chat
-            print("1. Sending multiple messages...")
-            for i in range(3):
-                await page.fill("#chatInput", f"Test message {i+1}")
-                await page.click("#sendButton")
-                await page.wait_for_timeout(1000)
-                print(f"  Sent message {i+1}")
-            
-            await page.wait_for_timeout(2000)
-            
-            # Check scroll position
-            print("\n2. Checking scroll position...")
-            chat_messages = page.locator("#chatMessages")
-            
-            # Get scroll info
-            scroll_info = await chat_messages.evaluate("""
-                el => ({
-                    scrollTop: el.scrollTop,
-                    scrollHeight: el.scrollHeight,
-                    clientHeight: el.clientHeight,
-                    isAtBottom: Math.abs(el.scrollHeight - el.clientHeight - el.scrollTop) < 10
-                })
-            """)
-            
-            print(f"  Scroll top: {scroll_info['scrollTop']}")
-            print(f"  Scroll height: {scroll_info['scrollHeight']}")
-            print(f"  Client height: {scroll_info['clientHeight']}")
-            
-            if scroll_info['isAtBottom']:
-                print("✓ Chat scrolled to bottom")
-            else:
-                print("⚠ Chat may not be at bottom (could be due to timing)")
-            
-            print("\n=== Scroll Behavior Test Passed! ===\n")
+        # Fill the chat with filler messages directly; only the scroll math matters here
+        print("1. Filling chat with messages...")
+        await page.evaluate("""() => {
+            const c = document.getElementById('chatMessages');
+            for (let i = 0; i < 20; i++) {
+                const d = document.createElement('div');
+                d.className = 'message user';
+                d.innerHTML = `<div class="message-content">Filler ${i}</div>`;
+                c.appendChild(d);
+            }
+        }""")
+        print("  Added 20 filler messages")
+        
+        # One (stubbed) query so the app itself performs the scroll-to-bottom
+        await page.fill("#chatInput", "Test message")
+        await page.click("#sendButton")
+        await expect(page.locator(".message.assistant:not(:has(.loading))").last).to_contain_text(
+            STUB_QUERY["answer"]
+        )
+        print("  Reply received")
+        
+        # Check scroll position
+        print("\n2. Checking scroll position...")
+        chat_messages = page.locator("#chatMessages")
+        
+        # Get scroll info
+        scroll_info = await chat_messages.evaluate("""
+            el => ({
+                scrollTop: el.scrollTop,
+                scrollHeight: el.scrollHeight,
+                clientHeight: el.clientHeight,
+                isAtBottom: Math.abs(el.scrollHeight - el.clientHeight - el.scrollTop) < 10
+            })
+        """)
+        
+        print(f"  Scroll top: {scroll_info['scrollTop']}")
+        print(f"  Scroll height: {scroll_info['scrollHeight']}")
+        print(f"  Client height: {scroll_info['clientHeight']}")
+        
+        if scroll_info['isAtBottom']:
+            print("✓ Chat scrolled to bottom")
+        else:
+            print("⚠ Chat may not be at bottom (could be due to timing)")
+        
+        print("\n=== Scroll Behavior Test Passed! ===\n")
+        if PAUSE_ON_CLOSE:
             await page.wait_for_timeout(2000)
-            await browser.close()
-            return True
-            
-        except Exception as e:
-            print(f"\n✗ Test failed with error: {e}")
-            await browser.close()
-            return False
+        return True
+        
+    except Exception as e:
+        print(f"\n✗ Test failed with error: {e}")
+        return False
+    finally:
+        await context.close()
 
 
-async def test_accessibility_features():
+async def test_accessibility_features(browser):
     """Test accessibility features"""
     print("\n=== Testing Accessibility Features ===\n")
     
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)
-        page = await browser.new_page()
+    context = await new_test_context(browser)
+    await stub_api(context)
+    page = await context.new_page()
+    
+    try:
+        await page.goto("http://localhost:8000", wait_until="domcontentloaded")
+        await expect(page.locator("#chatInput")).to_be_visible()
         
-        try:
-            await page.goto("http://localhost:8000", wait_until="networkidle")
-            await page.wait_for_timeout(1000)
-            
-            # Check ARIA labels
-            print("1. Checking ARIA labels...")
-            
-            theme_toggle = page.locator("#themeToggle")
-            aria_label = await theme_toggle.get_attribute("aria-label")
-            assert aria_label
-            print(f"✓ Theme toggle ARIA label: {aria_label}")
-            
-            # Check input accessibility
-            print("\n2. Checking input accessibility...")
-            chat_input = page.locator("#chatInput")
-            input_type = await chat_input.get_attribute("type")
-            placeholder = await chat_input.get_attribute("placeholder")
-            autocomplete = await chat_input.get_attribute("autocomplete")
-            
-            print(f"✓ Input type: {input_type}")
-            print(f"✓ Placeholder: {placeholder}")
-            print(f"✓ Autocomplete: {autocomplete}")
-            
-            # Check button accessibility
-            print("\n3. Checking button accessibility...")
-            buttons = page.locator("button")
-            button_count = await buttons.count()
-            print(f"✓ Total buttons: {button_count}")
-            
-            # Check keyboard navigation
-            print("\n4. Testing keyboard navigation...")
-            await page.locator("#chatInput").focus()
-            is_focused = await page.evaluate("document.activeElement.id === 'chatInput'")
-            assert is_focused
-            print("✓ Input can be focused")
-            
-            # Tab to send button
-            await page.keyboard.press("Tab")
-            await page.wait_for_timeout(100)
-            active_element = await page.evaluate("document.activeElement.id")
-            print(f"✓ Tab navigation works (focused: {active_element})")
-            
-            print("\n=== Accessibility Features Test Passed! ===\n")
+        # Read all accessibility attributes in one round-trip
+        state = await page.evaluate("""() => {
+            const i = document.getElementById('chatInput');
+            const t = document.getElementById('themeToggle');
+            return {
+                ariaLabel: t.getAttribute('aria-label'),
+                inputType: i.getAttribute('type'),
+                placeholder: i.getAttribute('placeholder'),
+                autocomplete: i.getAttribute('autocomplete'),
+                buttonCount: document.querySelectorAll('button').length
+            };
+        }""")
+        
+        # Check ARIA labels
+        print("1. Checking ARIA labels...")
+        assert state["ariaLabel"]
+        print(f"✓ Theme toggle ARIA label: {state['ariaLabel']}")
+        
+        # Check input accessibility
+        print("\n2. Checking input accessibility...")
+        print(f"✓ Input type: {state['inputType']}")
+        print(f"✓ Placeholder: {state['placeholder']}")
+        print(f"✓ Autocomplete: {state['autocomplete']}")
+        
+        # Check button accessibility
+        print("\n3. Checking button accessibility...")
+        print(f"✓ Total buttons: {state['buttonCount']}")
+        
+        # Check keyboard navigation
+        print("\n4. Testing keyboard navigation...")
+        # Focus and confirm focus in the same JS turn
+        is_focused = await page.locator("#chatInput").evaluate(
+            "el => { el.focus(); return document.activeElement === el; }"
+        )
+        assert is_focused
+        print("✓ Input can be focused")
+        
+        # Tab to send button
+        await page.keyboard.press("Tab")
+        active_element = await page.evaluate("document.activeElement.id")
+        print(f"✓ Tab navigation works (focused: {active_element})")
+        
+        print("\n=== Accessibility Features Test Passed! ===\n")
+        if PAUSE_ON_CLOSE:
             await page.wait_for_timeout(2000)
-            await browser.close()
-            return True
-            
-        except Exception as e:
-            print(f"\n✗ Test failed with error: {e}")
-            await browser.close()
-            return False
+        return True
+        
+    except Exception as e:
+        print(f"\n✗ Test failed with error: {e}")
+        return False
+    finally:
+        await context.close()
+
 
+TESTS = [
+    ("Sidebar Collapsibles", test_sidebar_collapsibles),
+    # Needs no browser; the lambda adapts it to the suite's test_fn(browser) calls
+    ("Layout Structure (static)", lambda browser: test_layout_structure_static()),
+    ("Layout Structure", test_layout_structure),
+    ("Responsive Design", test_responsive_design),
+    ("Message Display", test_message_display),
+    ("Scroll Behavior", test_scroll_behavior),
+    ("Accessibility Features", test_accessibility_features),
+]
 
-async def main():
-    """Run all UI component tests"""
+
+async def main(workers=None):
+    """Run all UI component tests
+
+    Tests share no state, so they run concurrently; ``workers`` caps how many
+    run at once (default: all of them).
+    """
     print("\n" + "="*60)
     print("UI COMPONENTS AND LAYOUT E2E TEST SUITE")
     print("="*60)
     
-    results = []
-    
-    # Test 1: Sidebar collapsibles
-    results.append(("Sidebar Collapsibles", await test_sidebar_collapsibles()))
-    
-    # Test 2: Layout structure
-    results.append(("Layout Structure", await test_layout_structure()))
-    
-    # Test 3: Responsive design
-    results.append(("Responsive Design", await test_responsive_design()))
+    semaphore = asyncio.Semaphore(workers or len(TESTS))
     
-    # Test 4: Message display
-    results.append(("Message Display", await test_message_display()))
+    async def run(test_fn, browser):
+        async with semaphore:
+            return await test_fn(browser)
     
-    # Test 5: Scroll behavior
-    results.append(("Scroll Behavior", await test_scroll_behavior()))
+    async with async_playwright() as p:
+        # One browser for the whole suite; each test isolates itself in its own context
+        browser = await p.chromium.launch(
+            headless=not HEADED,
+            args=["--disable-dev-shm-usage", "--no-sandbox"],
+        )
+        
+        try:
+            outcomes = await asyncio.gather(
+                *(run(test_fn, browser) for _, test_fn in TESTS), return_exceptions=True
+            )
+        finally:
+            await browser.close()
     
-    # Test 6: Accessibility
-    results.append(("Accessibility Features", await test_accessibility_features()))
+    results = [(name, outcome is True) for (name, _), outcome in zip(TESTS, outcomes)]
     
     # Summary
     print("\n" + "="*60)
@@ -415,5 +494,9 @@ async def main():
 
 
 if __name__ == "__main__":
-    exit_code = asyncio.run(main())
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="maximum number of tests to run at once (default: all)")
+    args = parser.parse_args()
+    exit_code = asyncio.run(main(args.workers))
     exit(exit_code)
@@ -1,28 +1,93 @@
 """
 Full-stack smoke test - Tests frontend served through the backend
+
+Runs headless at full speed. For demos, SMOKE_HEADED=1 SMOKE_SLOWMO=500
+reproduces the old visible, slowed-down run.
 """
+import argparse
+import os
+import subprocess
+import tempfile
 import time
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import Error as PlaywrightError, expect, sync_playwright
 
 BASE_URL = "http://127.0.0.1:8000"
 
-def test_full_integration():
+# Headless by default; SMOKE_HEADED=1 (or PW_HEADED=1) shows the browser window
+HEADED = "1" in (os.environ.get("SMOKE_HEADED"), os.environ.get("PW_HEADED"))
+
+# Milliseconds Playwright waits before every action; 0 unless watching a demo
+SLOW_MO = int(os.environ.get("SMOKE_SLOWMO", "0"))
+
+# Closing pause for headed runs (PW_PAUSE, see TESTING.md)
+PAUSE_ON_CLOSE = HEADED and os.environ.get("PW_PAUSE", "1") == "1"
+
+CDP_PORT = 9222
+CDP_PROFILE = os.path.join(tempfile.gettempdir(), "pw-profile")
+
+# True once the newest assistant message holds real text rather than the loading dots
+LAST_REPLY_PAINTED = """() => {
+    const el = document.querySelector(
+        '#chatMessages .message.assistant:last-child:not(:has(.loading)) .message-content');
+    return (el?.textContent?.trim().length ?? 0) > 10;
+}"""
+
+def send_query(page, timeout):
+    """Click send and block until /api/query answers and the reply is painted"""
+    with page.expect_response(
+        lambda r: "/api/query" in r.url, timeout=timeout
+    ) as response_info:
+        page.locator("#sendButton").click()
+    response = response_info.value
+    assert response.status == 200, f"/api/query returned {response.status}"
+    page.wait_for_function(LAST_REPLY_PAINTED, timeout=5000)
+
+def start_debug_browser(port=CDP_PORT, user_data_dir=CDP_PROFILE):
+    """Launch a long-lived Chromium that later runs attach to via --cdp-endpoint"""
+    with sync_playwright() as p:
+        executable = p.chromium.executable_path
+    args = [
+        executable,
+        f"--remote-debugging-port={port}",
+        f"--user-data-dir={user_data_dir}",
+        "--no-first-run",
+        "--no-sandbox",
+    ]
+    if not HEADED:
+        args.append("--headless=new")
+    subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+    return f"http://127.0.0.1:{port}"
+
+def test_full_integration(cdp_endpoint=None):
     """Test complete frontend-backend integration"""
     print("\n🔍 Full Stack Integration Test")
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False, slow_mo=500)
+        if cdp_endpoint:
+            # Reuse an already running browser; only our context is torn down
+            browser = p.chromium.connect_over_cdp(cdp_endpoint)
+        else:
+            browser = p.chromium.launch(
+                headless=not HEADED,
+                slow_mo=SLOW_MO,
+                args=["--disable-dev-shm-usage", "--no-sandbox"],
+            )
         context = browser.new_context()
         page = context.new_page()
         
         try:
             # Navigate to the static frontend (mounted at root)
             print("   ⏳ Loading frontend from backend...")
-            page.goto(f"{BASE_URL}/", timeout=10000)
+            # The first navigation doubles as the liveness check; a refused
+            # connection fails immediately, a hung server times out
+            try:
+                page.goto(f"{BASE_URL}/", wait_until="domcontentloaded", timeout=10000)
+            except PlaywrightError:
+                print(f"❌ Server is NOT running at {BASE_URL}")
+                print("   Start server first: ./run.sh or .\\run.ps1\n")
+                exit(1)
+            expect(page.locator("#chatInput")).to_be_visible()
             print("   ✓ Frontend loaded from backend")
             
-            # Wait for page to be fully ready
-            page.wait_for_load_state("networkidle", timeout=10000)
-            
             # Verify UI elements
             title = page.title()
             print(f"   ✓ Page title: {title}")
@@ -30,55 +95,45 @@ def test_full_integration():
             # Check course stats loaded
             course_stats = page.locator("#totalCourses")
             if course_stats.is_visible():
+                # Placeholder is "-" until /api/courses answers
+                expect(course_stats).not_to_have_text("-", timeout=10000)
                 stats_text = course_stats.text_content()
                 print(f"   ✓ Course stats: {stats_text} courses")
             
             # Test 1: Simple query
             print("\n   📝 Test 1: Simple General Query")
+            # Replies exclude the welcome message, which is also .message.assistant
+            replies = page.locator("#chatMessages .message.assistant:not(.welcome-message)")
+            
             input_field = page.locator("#chatInput")
             input_field.fill("What is RAG?")
             print("      ✓ Query entered: 'What is RAG?'")
             
-            send_button = page.locator("#sendButton")
-            send_button.click()
-            print("      ✓ Send button clicked")
-            
-            # Wait for response
-            page.wait_for_selector("#chatMessages .message.assistant", timeout=15000)
+            send_query(page, timeout=15000)
+            expect(replies).to_have_count(1, timeout=5000)
             print("      ✓ Response received")
             
             # Get response text
-            assistant_messages = page.locator("#chatMessages .message.assistant")
-            if assistant_messages.count() > 0:
-                response = assistant_messages.last.text_content()
-                print(f"      ✓ Response length: {len(response)} chars")
-                if len(response) > 50:
-                    print(f"      ✓ Preview: {response[:100]}...")
-            
-            time.sleep(2)
+            response = replies.last.text_content()
+            print(f"      ✓ Response length: {len(response)} chars")
+            if len(response) > 50:
+                print(f"      ✓ Preview: {response[:100]}...")
             
             # Test 2: Course-specific query (should use tools)
             print("\n   📝 Test 2: Course-Specific Query (Tool Calling)")
             input_field.fill("What is covered in lesson 3 of the MCP course?")
             print("      ✓ Query entered: course-specific question")
             
-            send_button.click()
-            print("      ✓ Send button clicked")
-            
-            # Wait for response (might take longer with tool calls)
-            page.wait_for_selector("#chatMessages .message.assistant", timeout=20000)
-            time.sleep(1)  # Wait for animation
+            # Might take longer with tool calls
+            send_query(page, timeout=20000)
+            expect(replies).to_have_count(2, timeout=5000)
             print("      ✓ Response received (tool may have been called)")
             
             # Check response
-            assistant_messages = page.locator("#chatMessages .message.assistant")
-            if assistant_messages.count() >= 2:
-                response = assistant_messages.last.text_content()
-                print(f"      ✓ Response length: {len(response)} chars")
-                if "lesson" in response.lower() or "mcp" in response.lower():
-                    print("      ✓ Response seems relevant to query")
-            
-            time.sleep(2)
+            response = replies.last.text_content()
+            print(f"      ✓ Response length: {len(response)} chars")
+            if "lesson" in response.lower() or "mcp" in response.lower():
+                print("      ✓ Response seems relevant to query")
             
             # Test 3: Multi-round capable query
             print("\n   📝 Test 3: Multi-Round Query (New Feature)")
@@ -86,32 +141,25 @@ def test_full_integration():
             input_field.fill(complex_query)
             print("      ✓ Complex multi-step query entered")
             
-            send_button.click()
-            print("      ✓ Send button clicked")
-            
-            # Wait for response (may take longer with multiple rounds)
+            # May take longer with multiple rounds
             try:
-                page.wait_for_selector("#chatMessages .message.assistant", timeout=25000)
-                time.sleep(1)
+                send_query(page, timeout=25000)
+                expect(replies).to_have_count(3, timeout=5000)
                 print("      ✓ Response received (multi-round processing completed)")
                 
-                assistant_messages = page.locator("#chatMessages .message.assistant")
-                if assistant_messages.count() >= 3:
-                    response = assistant_messages.last.text_content()
-                    print(f"      ✓ Response length: {len(response)} chars")
-                    
-                    # Check if response mentions both courses
-                    response_lower = response.lower()
-                    if "building" in response_lower or "mcp" in response_lower:
-                        print("      ✓ Response references course content")
-                    if len(response) > 200:
-                        print("      ✓ Substantial response (likely used multiple tool rounds)")
+                response = replies.last.text_content()
+                print(f"      ✓ Response length: {len(response)} chars")
+                
+                # Check if response mentions both courses
+                response_lower = response.lower()
+                if "building" in response_lower or "mcp" in response_lower:
+                    print("      ✓ Response references course content")
+                if len(response) > 200:
+                    print("      ✓ Substantial response (likely used multiple tool rounds)")
                         
             except Exception as e:
                 print(f"      ⚠ Multi-round test couldn't fully verify: {e}")
             
-            time.sleep(3)
-            
             # Test 4: New chat button
             print("\n   📝 Test 4: New Chat Functionality")
             new_chat_button = page.locator("#newChatButton")
@@ -120,17 +168,12 @@ def test_full_integration():
                 print(f"      ✓ Messages before new chat: {message_count_before}")
                 
                 new_chat_button.click()
-                time.sleep(1)
-                
-                message_count_after = page.locator("#chatMessages .message").count()
-                print(f"      ✓ Messages after new chat: {message_count_after}")
                 
-                if message_count_after == 0:
-                    print("      ✓ Chat cleared successfully")
-                else:
-                    print(f"      ⚠ Chat not fully cleared (still {message_count_after} messages)")
+                # A cleared chat holds only the fresh welcome message
+                expect(page.locator("#chatMessages .message")).to_have_count(1, timeout=5000)
+                expect(page.locator("#chatMessages .welcome-message")).to_be_visible()
+                print("      ✓ Chat cleared successfully (welcome message only)")
             
-            time.sleep(3)
             print("\n   ✅ All integration tests completed!")
             
         except Exception as e:
@@ -142,11 +185,26 @@ def test_full_integration():
                 pass
             raise
         finally:
-            print("\n   ⏸ Closing browser in 3 seconds...")
-            time.sleep(3)
-            browser.close()
+            if PAUSE_ON_CLOSE:
+                print("\n   ⏸ Closing browser in 3 seconds...")
+                time.sleep(3)
+            context.close()
+            if not cdp_endpoint:
+                browser.close()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Full-stack smoke test")
+    parser.add_argument("--cdp-endpoint", help="attach to a running Chromium, e.g. http://127.0.0.1:9222")
+    parser.add_argument("--start-browser", action="store_true",
+                        help=f"launch a background Chromium on port {CDP_PORT} and exit")
+    cli = parser.parse_args()
+
+    if cli.start_browser:
+        endpoint = start_debug_browser()
+        print(f"Chromium listening at {endpoint}")
+        print(f"Run: python smoke_test_integration.py --cdp-endpoint {endpoint}")
+        exit(0)
+
     print("=" * 70)
     print("🚀 RAG Chatbot Full-Stack Integration Test")
     print("=" * 70)
@@ -158,18 +216,8 @@ if __name__ == "__main__":
     print("  5. Test new chat functionality")
     print("\n" + "=" * 70)
     
-    # Check if server is running
-    import requests
-    try:
-        response = requests.get(BASE_URL, timeout=2)
-        print(f"✓ Server is running at {BASE_URL}\n")
-    except:
-        print(f"❌ Server is NOT running at {BASE_URL}")
-        print("   Start server first: ./run.sh or .\\run.ps1\n")
-        exit(1)
-    
     try:
-        test_full_integration()
+        test_full_integration(cli.cdp_endpoint)
         print("\n" + "=" * 70)
         print("✅ ALL TESTS PASSED - Integration successful!")
         print("=" * 70)
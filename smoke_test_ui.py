@@ -1,254 +1,421 @@
 """
 Smoke tests for RAG Chatbot UI using Playwright
 Tests the frontend and API integration
+
+Run with pytest; `python smoke_test_ui.py` checks the server and then shards the
+tests across cores with pytest-xdist (pip install pytest-xdist).
+
+`python smoke_test_ui.py --concurrent` instead runs just the two query flows
+side by side in one event loop (playwright.async_api) on a single browser.
 """
+import argparse
+import asyncio
 import os
+import subprocess
+import sys
+import tempfile
 import time
+from pathlib import Path
+
+import pytest
+import requests
+from playwright.async_api import async_playwright
 from playwright.sync_api import sync_playwright, expect
 
 # Configuration
 BASE_URL = "http://127.0.0.1:8000"
 FRONTEND_PATH = os.path.join(os.path.dirname(__file__), "frontend", "index.html")
+FRONTEND_URL = Path(FRONTEND_PATH).resolve().as_uri()
+
+# Keep-alive HTTP session for direct API checks, so they reuse one connection
+session = requests.Session()
+
+# Headless by default; SMOKE_HEADED=1 shows the browser, except under xdist where
+# workers run side by side and windows would only contend with each other
+UNDER_XDIST = "PYTEST_XDIST_WORKER" in os.environ
+HEADLESS = os.environ.get("SMOKE_HEADED") != "1" or UNDER_XDIST
+
+# SMOKE_VISUAL=1 keeps pages open for a moment after each test for inspection
+VISUAL = os.environ.get("SMOKE_VISUAL") == "1"
+
+# SMOKE_PERSISTENT=1 backs the shared read-only context with a Chromium profile
+# (V8 code cache, HTTP cache) kept between runs; a CI cache step can carry CACHE_DIR
+PERSISTENT = os.environ.get("SMOKE_PERSISTENT") == "1"
+CACHE_DIR = os.path.join(tempfile.gettempdir(), "smoke-ui-cache")
+
+# Record a Playwright trace per test (also enabled by -vvv)
+TRACE = os.environ.get("PW_TRACE") == "1"
+
+SIMPLE_QUERY = "What courses are available?"
+MULTI_ROUND_QUERY = "Search for courses that discuss similar topics to lesson 3 of Building Towards Computer Use"
+
+# The welcome message is already in the chat, so a reply means the last message
+# is an assistant message that is no longer the loading placeholder
+REPLY_LANDED = """() => document.querySelectorAll('#chatMessages .message').length >= 3
+    && !!document.querySelector('#chatMessages .message.assistant:last-child:not(:has(.loading))')"""
+
+# Message count and the last message's text in one round-trip
+COUNT_AND_LAST_TEXT = """() => {
+    const m = document.querySelectorAll('#chatMessages .message');
+    return [m.length, m[m.length - 1]?.textContent || ''];
+}"""
+
+
+@pytest.fixture(scope="session")
+def playwright():
+    """One Playwright driver per worker process"""
+    pw = sync_playwright().start()
+    yield pw
+    pw.stop()
+
+
+@pytest.fixture(scope="session")
+def browser(playwright):
+    """Chromium launched once and shared by every test in the worker"""
+    browser = playwright.chromium.launch(headless=HEADLESS)
+    yield browser
+    browser.close()
+
+
+# Requests the read-only checks never assert on
+BLOCKED_REQUESTS = ["**/*.{png,jpg,jpeg,webp,svg,woff,woff2,ttf}", "**/analytics*/**"]
+
+
+def _abort(route):
+    route.abort()
+
+
+@pytest.fixture(scope="session")
+def api_ready():
+    """Whether the backend API is reachable; probed once so query tests can skip fast
+
+    Uses the cheap /api/courses instead of a real query (no LLM call, no stray
+    session). Only an unreachable server or an error status counts as down; a
+    slow answer is left to the query tests' own timeouts.
+    """
+    try:
+        return session.get(f"{BASE_URL}/api/courses", timeout=5).ok
+    except requests.Timeout:
+        return True
+    except requests.RequestException:
+        return False
+
+
+@pytest.fixture(scope="session")
+def shared_context(request):
+    """One context for the read-only tests, with images, fonts and analytics aborted
+
+    These tests touch no cookies or storage, so they can share it. With
+    SMOKE_PERSISTENT=1 it is backed by a cached profile instead.
+    """
+    if PERSISTENT:
+        # A profile directory can only be open in one browser, so each worker gets its own
+        user_data_dir = os.path.join(CACHE_DIR, os.environ.get("PYTEST_XDIST_WORKER", "main"))
+        playwright = request.getfixturevalue("playwright")
+        context = playwright.chromium.launch_persistent_context(user_data_dir, headless=HEADLESS)
+    else:
+        context = request.getfixturevalue("browser").new_context()
+    for pattern in BLOCKED_REQUESTS:
+        context.route(pattern, _abort)
+    yield context
+    context.close()
+
 
-def test_api_health():
+@pytest.fixture
+def shared_page(shared_context):
+    """Page on the shared context, closed after the test so pages don't pile up
+
+    Closing in teardown rather than in the test keeps the page open for the
+    failure screenshot taken by conftest.py.
+    """
+    page = shared_context.new_page()
+    yield page
+    page.close()
+
+
+@pytest.fixture
+def fresh_context(browser):
+    """Isolated context for tests that change chat session state; closed right after"""
+    context = browser.new_context()
+    yield context
+    context.close()
+
+
+@pytest.fixture(autouse=True)
+def _trace(request):
+    """Trace the test's context when PW_TRACE=1 or -vvv; conftest.py saves it on failure"""
+    name = next(
+        (n for n in ("fresh_context", "shared_context") if n in request.fixturenames), None
+    )
+    request.node.smoke_tracing = bool(name) and (
+        TRACE or request.config.getoption("verbose") >= 3
+    )
+    if not request.node.smoke_tracing:
+        yield
+        return
+
+    context = request.getfixturevalue(name)
+    context.tracing.start(screenshots=True, snapshots=True)
+    yield
+    # The failure hook stops the trace itself and clears the flag
+    if request.node.smoke_tracing:
+        context.tracing.stop()
+
+
+def test_api_health(shared_page):
     """Test that API is responding"""
     print("\n🔍 Test 1: API Health Check")
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context()
-        page = context.new_page()
-        
-        try:
-            # Test API docs endpoint
-            response = page.goto(f"{BASE_URL}/docs", timeout=10000)
-            assert response.status == 200, f"Expected 200, got {response.status}"
-            print("   ✓ API /docs endpoint responding")
-            
-            # Check page loaded
-            page.wait_for_load_state("networkidle", timeout=10000)
-            print(f"   ✓ API Documentation loaded successfully")
-            
-        except Exception as e:
-            print(f"   ✗ API Health Check failed: {e}")
-            raise
-        finally:
-            browser.close()
+    page = shared_page
+
+    try:
+        # Test API docs endpoint
+        response = page.goto(f"{BASE_URL}/docs", timeout=10000)
+        assert response.status == 200, f"Expected 200, got {response.status}"
+        print("   ✓ API /docs endpoint responding")
 
-def test_frontend_loads():
+        # Swagger UI renders into #swagger-ui once its bundle has run
+        page.wait_for_selector("#swagger-ui", timeout=5000)
+        print(f"   ✓ API Documentation loaded successfully")
+
+    except Exception as e:
+        print(f"   ✗ API Health Check failed: {e}")
+        raise
+
+def test_frontend_loads(shared_page):
     """Test that frontend HTML loads correctly"""
     print("\n🔍 Test 2: Frontend Page Load")
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)  # Visible browser for debugging
-        context = browser.new_context()
-        page = context.new_page()
-        
-        try:
-            # Load frontend HTML file
-            page.goto(f"file:///{FRONTEND_PATH.replace(chr(92), '/')}")
-            print(f"   ✓ Frontend loaded from: {FRONTEND_PATH}")
-            
-            # Check title
-            title = page.title()
-            assert "Course" in title or "RAG" in title or "Chat" in title or "Assistant" in title, f"Unexpected title: {title}"
-            print(f"   ✓ Page title: {title}")
-            
-            # Check for key UI elements
-            input_field = page.locator("#chatInput")
-            assert input_field.is_visible(), "Chat input not found"
-            print("   ✓ Chat input field found")
-            
-            # Check for send button (it's an SVG icon button)
-            send_button = page.locator("#sendButton")
-            assert send_button.is_visible(), "Send button not found"
-            print("   ✓ Send button found")
-            
-            # Check for chat messages area
-            chat_area = page.locator("#chatMessages")
-            assert chat_area.is_visible(), "Chat messages area not found"
-            print("   ✓ Chat messages area found")
-            
-            # Check for sidebar
-            sidebar = page.locator(".sidebar")
-            if sidebar.count() > 0:
-                print("   ✓ Sidebar found")
-            
+    page = shared_page
+
+    try:
+        # Load frontend HTML file
+        page.goto(FRONTEND_URL)
+        print(f"   ✓ Frontend loaded from: {FRONTEND_PATH}")
+
+        # Check title
+        title = page.title()
+        assert "Course" in title or "RAG" in title or "Chat" in title or "Assistant" in title, f"Unexpected title: {title}"
+        print(f"   ✓ Page title: {title}")
+
+        # Check for key UI elements; expect() retries until they render
+        input_field = page.locator("#chatInput")
+        expect(input_field).to_be_visible(timeout=2000)
+        print("   ✓ Chat input field found")
+
+        # Check for send button (it's an SVG icon button)
+        send_button = page.locator("#sendButton")
+        expect(send_button).to_be_visible(timeout=2000)
+        print("   ✓ Send button found")
+
+        # Check for chat messages area
+        chat_area = page.locator("#chatMessages")
+        expect(chat_area).to_be_visible(timeout=2000)
+        print("   ✓ Chat messages area found")
+
+        # Check for sidebar
+        sidebar = page.locator(".sidebar")
+        if sidebar.count() > 0:
+            print("   ✓ Sidebar found")
+
+        if VISUAL:
             time.sleep(2)  # Keep browser open for visual inspection
-            
-        except Exception as e:
-            print(f"   ✗ Frontend load failed: {e}")
-            raise
-        finally:
-            browser.close()
 
-def test_simple_query():
+    except Exception as e:
+        print(f"   ✗ Frontend load failed: {e}")
+        raise
+
+def test_simple_query(fresh_context, api_ready):
     """Test sending a simple query through the UI"""
+    if not api_ready:
+        pytest.skip("backend API unreachable")
     print("\n🔍 Test 3: Simple Query Test")
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        context = browser.new_context()
-        page = context.new_page()
-        
+    page = fresh_context.new_page()
+    chat_input = page.locator("#chatInput")
+    send_button = page.locator("#sendButton")
+
+    try:
+        # Load frontend
+        page.goto(FRONTEND_URL)
+        print("   ✓ Frontend loaded")
+
+        # Only the input has to be visible before we type into it
+        expect(chat_input).to_be_visible(timeout=5000)
+
+        chat_input.fill(SIMPLE_QUERY)
+        print(f"   ✓ Query entered: '{SIMPLE_QUERY}'")
+
+        send_button.click()
+        print("   ✓ Send button clicked")
+
+        # Wait for response (with timeout)
         try:
-            # Load frontend
-            page.goto(f"file:///{FRONTEND_PATH.replace(chr(92), '/')}")
-            print("   ✓ Frontend loaded")
-            
-            # Wait for page to be ready
-            page.wait_for_load_state("networkidle")
-            
-            # Find input field
-            input_field = page.locator("#chatInput")
-            input_field.fill("What courses are available?")
-            print("   ✓ Query entered: 'What courses are available?'")
-            
-            # Click send button
-            send_button = page.locator("#sendButton")
-            send_button.click()
-            print("   ✓ Send button clicked")
-            
-            # Wait for response (with timeout)
-            try:
-                # Wait for message to appear in chat
-                page.wait_for_selector("#chatMessages .message", timeout=15000)
-                print("   ✓ Response received")
-                
-                # Check if response contains text
-                messages = page.locator("#chatMessages .message")
-                message_count = messages.count()
-                print(f"   ✓ Messages in chat: {message_count}")
-                
-                if message_count > 0:
-                    last_message = messages.last
-                    response_text = last_message.text_content()
-                    
-                    if response_text and len(response_text) > 10:
-                        print(f"   ✓ Response length: {len(response_text)} characters")
-                        print(f"   ✓ Response preview: {response_text[:100]}...")
-                    else:
-                        print(f"   ⚠ Response seems short: {response_text}")
+            # Wait for the assistant reply to replace the loading placeholder
+            page.wait_for_function(REPLY_LANDED, timeout=15000)
+            print("   ✓ Response received")
+
+            # Check if response contains text
+            message_count, response_text = page.evaluate(COUNT_AND_LAST_TEXT)
+            print(f"   ✓ Messages in chat: {message_count}")
+
+            if message_count > 0:
+                if response_text and len(response_text) > 10:
+                    print(f"   ✓ Response length: {len(response_text)} characters")
+                    print(f"   ✓ Response preview: {response_text[:100]}...")
                 else:
-                    print("   ⚠ No messages found in chat")
-                    
-            except Exception as e:
-                print(f"   ⚠ Could not verify response: {e}")
-            
-            time.sleep(3)  # Keep browser open for inspection
-            
+                    print(f"   ⚠ Response seems short: {response_text}")
+            else:
+                print("   ⚠ No messages found in chat")
+
         except Exception as e:
-            print(f"   ✗ Query test failed: {e}")
-            try:
-                page.screenshot(path="test_error.png")
-                print("   📸 Screenshot saved to test_error.png")
-            except:
-                pass
-            raise
-        finally:
-            browser.close()
+            print(f"   ⚠ Could not verify response: {e}")
+
+        if VISUAL:
+            time.sleep(3)  # Keep browser open for inspection
+
+    except Exception as e:
+        print(f"   ✗ Query test failed: {e}")
+        raise
 
-def test_multi_round_query():
+def test_multi_round_query(fresh_context, api_ready):
     """Test a complex query that might trigger 2-round tool calling"""
+    if not api_ready:
+        pytest.skip("backend API unreachable")
     print("\n🔍 Test 4: Multi-Round Query Test (New Feature)")
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        context = browser.new_context()
-        page = context.new_page()
-        
-        try:
-            # Load frontend
-            page.goto(f"file:///{FRONTEND_PATH.replace(chr(92), '/')}")
-            print("   ✓ Frontend loaded")
-            
-            # Wait for page ready
-            page.wait_for_load_state("networkidle")
-            
-            # Complex query that requires multiple searches
-            complex_query = "Search for courses that discuss similar topics to lesson 3 of Building Towards Computer Use"
-            
-            input_field = page.locator("#chatInput")
-            input_field.fill(complex_query)
-            print(f"   ✓ Complex query entered")
-            
-            # Click send
-            send_button = page.locator("#sendButton")
-            send_button.click()
-            print("   ✓ Send button clicked")
-            
-            # Wait longer for potential multi-round processing
-            try:
-                page.wait_for_selector("#chatMessages .message", timeout=20000)
-                print("   ✓ Response received (multi-round processing may have occurred)")
-                
-                messages = page.locator("#chatMessages .message")
-                message_count = messages.count()
-                
-                if message_count > 0:
-                    last_message = messages.last
-                    response_text = last_message.text_content()
-                    
-                    if response_text:
-                        print(f"   ✓ Response length: {len(response_text)} characters")
-                        if len(response_text) > 100:
-                            print("   ✓ Substantial response received (good sign for multi-round)")
-                else:
-                    print("   ⚠ No messages found")
-                        
-            except Exception as e:
-                print(f"   ⚠ Response verification failed: {e}")
-            
-            time.sleep(3)
-            
-        except Exception as e:
-            print(f"   ✗ Multi-round test failed: {e}")
-            try:
-                page.screenshot(path="test_multiround_error.png")
-            except:
-                pass
-            raise
-        finally:
-            browser.close()
+    page = fresh_context.new_page()
+    chat_input = page.locator("#chatInput")
+    send_button = page.locator("#sendButton")
 
-def run_all_tests():
-    """Run all smoke tests"""
-    print("=" * 60)
-    print("🚀 Starting UI Smoke Tests for RAG Chatbot")
-    print("=" * 60)
-    
-    tests = [
-        ("API Health Check", test_api_health),
-        ("Frontend Load", test_frontend_loads),
-        ("Simple Query", test_simple_query),
-        ("Multi-Round Query", test_multi_round_query)
-    ]
-    
-    passed = 0
-    failed = 0
-    
-    for test_name, test_func in tests:
+    try:
+        # Load frontend
+        page.goto(FRONTEND_URL)
+        print("   ✓ Frontend loaded")
+
+        # Only the input has to be visible before we type into it
+        expect(chat_input).to_be_visible(timeout=5000)
+
+        # Complex query that requires multiple searches
+        chat_input.fill(MULTI_ROUND_QUERY)
+        print(f"   ✓ Complex query entered")
+
+        send_button.click()
+        print("   ✓ Send button clicked")
+
+        # Wait longer for potential multi-round processing. Replies are not
+        # streamed, so fail fast if the send never registered (no loading
+        # placeholder or reply yet), then give the reply the rest of the budget
         try:
-            test_func()
-            passed += 1
-            print(f"✅ {test_name} PASSED")
+            page.wait_for_function(
+                f"() => !!document.querySelector('#chatMessages .loading') || ({REPLY_LANDED})()",
+                timeout=3000,
+            )
+            page.wait_for_function(REPLY_LANDED, timeout=17000)
+            print("   ✓ Response received (multi-round processing may have occurred)")
+
+            message_count, response_text = page.evaluate(COUNT_AND_LAST_TEXT)
+
+            if message_count > 0:
+                if response_text:
+                    print(f"   ✓ Response length: {len(response_text)} characters")
+                    if len(response_text) > 100:
+                        print("   ✓ Substantial response received (good sign for multi-round)")
+            else:
+                print("   ⚠ No messages found")
+
         except Exception as e:
-            failed += 1
-            print(f"❌ {test_name} FAILED: {e}")
-        print()
-    
-    print("=" * 60)
-    print(f"📊 Test Results: {passed} passed, {failed} failed")
-    print("=" * 60)
-    
-    return failed == 0
+            print(f"   ⚠ Response verification failed: {e}")
 
-if __name__ == "__main__":
-    # Check if server is running
-    import requests
+        if VISUAL:
+            time.sleep(3)
+
+    except Exception as e:
+        print(f"   ✗ Multi-round test failed: {e}")
+        raise
+
+async def _query_flow(browser, label, query, timeout):
+    """Async counterpart of the query tests, in its own context; returns the reply text"""
+    context = await browser.new_context()
+    try:
+        page = await context.new_page()
+        chat_input = page.locator("#chatInput")
+        await page.goto(FRONTEND_URL)
+        await chat_input.wait_for(timeout=5000)
+        await chat_input.fill(query)
+        await page.locator("#sendButton").click()
+        await page.wait_for_function(REPLY_LANDED, timeout=timeout)
+        response_text = await page.locator("#chatMessages .message").last.text_content()
+        print(f"   ✓ {label}: {len(response_text)} characters")
+        return response_text
+    finally:
+        await context.close()
+
+def server_is_up():
+    """Check the backend answers; HEAD skips downloading the page body"""
     try:
-        response = requests.get(BASE_URL, timeout=2)
+        session.head(f"{BASE_URL}/docs", timeout=2)
         print(f"✓ Server is running at {BASE_URL}")
-    except:
+        return True
+    except requests.RequestException:
         print(f"⚠ Warning: Server may not be running at {BASE_URL}")
         print("   Start server with: ./run.sh or .\\run.ps1")
+        return False
+
+async def run_query_tests_concurrently():
+    """Run both query flows at once; the wait is max(t1, t2) rather than t1 + t2
+
+    The server check runs in a thread while Chromium cold-starts.
+    """
+    flows = [
+        ("Simple Query", SIMPLE_QUERY, 15000),
+        ("Multi-Round Query", MULTI_ROUND_QUERY, 20000),
+    ]
+    async with async_playwright() as p:
+        server_ok, browser = await asyncio.gather(
+            asyncio.to_thread(server_is_up), p.chromium.launch(headless=HEADLESS)
+        )
+        try:
+            if not server_ok:
+                return False
+            outcomes = await asyncio.gather(
+                *(_query_flow(browser, *flow) for flow in flows), return_exceptions=True
+            )
+        finally:
+            await browser.close()
+
+    for (label, _, _), outcome in zip(flows, outcomes):
+        if isinstance(outcome, Exception):
+            print(f"❌ {label} FAILED: {outcome}")
+        else:
+            print(f"✅ {label} PASSED")
+    return not any(isinstance(outcome, Exception) for outcome in outcomes)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="UI smoke tests for the RAG chatbot")
+    parser.add_argument("--concurrent", action="store_true",
+                        help="run only the query flows, concurrently in one process")
+    cli = parser.parse_args()
+
+    if cli.concurrent:
+        exit(0 if asyncio.run(run_query_tests_concurrently()) else 1)
+
+    # Shard across cores, leaving two free for the browser and the server.
+    # Start pytest straight away so worker start-up and browser launches overlap
+    # the server check. Its output stays in the pipe until the check passes, so a
+    # down server only prints the check's message; abandon the run in that case.
+    workers = max(1, (os.cpu_count() or 1) - 2)
+    print("=" * 60)
+    print(f"🚀 Running UI Smoke Tests for RAG Chatbot ({workers} workers)")
+    print("=" * 60)
+    sys.stdout.flush()
+    pytest_run = subprocess.Popen(
+        [sys.executable, "-m", "pytest", "-n", str(workers), __file__],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+    if not server_is_up():
+        pytest_run.terminate()
+        pytest_run.wait()
         exit(1)
-    
-    success = run_all_tests()
-    exit(0 if success else 1)
+
+    for line in pytest_run.stdout:
+        sys.stdout.buffer.write(line)
+        sys.stdout.buffer.flush()
+    exit(pytest_run.wait())